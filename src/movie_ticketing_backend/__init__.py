@@ -1,15 +1,33 @@
 """Movie Ticketing Backend - 메인 진입점"""
+import os
+
 import uvicorn
 
 
 def main():
-    """메인 진입점 - uvicorn을 factory 모드로 실행"""
+    """메인 진입점 - uvicorn을 factory 모드로 실행 (uvloop 이벤트 루프(설치된 경우) + httptools 파서)"""
+    from movie_ticketing_backend.util.boot_marker import set_boot_marker
+    from movie_ticketing_backend.util.idempotency import check_worker_count
+    
+    # 프로세스 수는 WEB_CONCURRENCY로 지정 (memory 멱등성 백엔드는 1개만 허용)
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    check_worker_count(workers)
+    
+    # 모든 워커 프로세스가 같은 기준으로 중단된 환불 작업을 판단하도록 실행 시각 전달
+    set_boot_marker()
     uvicorn.run(
         "movie_ticketing_backend.app:create_app",
         host="0.0.0.0",
         port=9000,
         factory=True,
-        reload=False,
+        lifespan="on",
+        # uvloop은 Windows에서 설치되지 않으므로 auto로 지정 (설치되어 있으면 uvloop 사용)
+        # 운영 환경의 Gunicorn 워커(UvloopWorker)는 uvloop을 필수로 요구
+        loop="auto",
+        http="httptools",
+        timeout_keep_alive=30,
+        limit_concurrency=1000,
+        workers=workers,
     )
 
 
@@ -1,9 +1,32 @@
 """FastAPI 애플리케이션 팩토리"""
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
-from movie_ticketing_backend.db.session import init_db
+from movie_ticketing_backend.db.session import get_engine, init_db, warm_up_pool
 from movie_ticketing_backend.route.ticket_route import router as ticket_router
+from movie_ticketing_backend.service.ticket_service import fail_interrupted_refund_jobs, wait_refund_jobs
+from movie_ticketing_backend.util.idempotency import get_idempotency_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 수명주기 - 요청 수신 전에 멱등성 백엔드 검증, DB 초기화, 중단된 환불 작업 정리와 커넥션 풀 예열, 종료 시 백그라운드 환불 완료 후 캐시/풀 정리"""
+    # 멱등성 백엔드 설정 오류(알 수 없는 백엔드, redis 미설치)는 요청마다 500이 아니라 시작 시 실패로 드러나도록 먼저 생성
+    idempotency_cache = get_idempotency_cache()
+    await init_db()
+    await fail_interrupted_refund_jobs()
+    await warm_up_pool()
+    yield
+    try:
+        await wait_refund_jobs()
+        await idempotency_cache.close()
+    finally:
+        # 캐시 정리에 실패해도 DB 커넥션 풀은 항상 정리
+        await get_engine().dispose()
 
 
 def create_app() -> FastAPI:
@@ -15,6 +38,8 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     
     # CORS 미들웨어 추가
@@ -26,15 +51,12 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # 1KB 이상 응답 gzip 압축 (대량 목록 조회 응답 전송량 감소)
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    
     # 라우터 등록
     app.include_router(ticket_router)
     
-    # 시작 이벤트
-    @app.on_event("startup")
-    async def startup_event():
-        """애플리케이션 시작 시 데이터베이스 초기화"""
-        init_db()
-    
     # 헬스 체크 엔드포인트
     @app.get("/", tags=["health"])
     async def health_check():
@@ -1,39 +1,131 @@
 """티켓 리포지토리"""
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+import orjson
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+from movie_ticketing_backend.entity.refund_job import RefundJob
 from movie_ticketing_backend.entity.ticket import Ticket
+from movie_ticketing_backend.util.uuid7 import uuid7_many
+
+
+# 스트리밍 조회 시 한 번에 가져오는 행 수
+STREAM_BATCH_SIZE = 100
+
+# 목록 조회 필터 이름 -> 컬럼 (요청마다 컬럼 속성을 다시 찾지 않도록 모듈 로드 시 1회 구성)
+FILTER_COLS = {
+    "theater_name": Ticket.theater_name,
+    "user_id": Ticket.user_id,
+    "movie_title": Ticket.movie_title,
+    "status": Ticket.status,
+}
+
+
+def _ticket_id_in() -> ColumnElement[bool]:
+    """
+    `id IN (SELECT value FROM json_each(:ticket_ids))` 조건 생성
+    
+    ID 목록을 JSON 배열 문자열 파라미터 하나로 전달해 목록 길이와 무관하게 SQL 문자열이 같으므로
+    sqlite3 문 캐시가 항상 재사용됨 (IN (?, ?, ...) 확장은 길이마다 다른 문으로 다시 파싱/계획)
+    """
+    ids = func.json_each(bindparam("ticket_ids")).table_valued("value")
+    return Ticket.id.in_(select(ids.c.value))
+
+
+def _encode_ids(ticket_ids: Iterable[str]) -> str:
+    """ID 목록을 json_each 파라미터용 JSON 배열 문자열로 변환"""
+    return orjson.dumps(list(ticket_ids)).decode()
 
 
 class TicketRepository:
-    """티켓 CRUD 작업을 담당하는 리포지토리"""
+    """티켓 CRUD 작업을 담당하는 리포지토리 (커밋은 호출 측 트랜잭션에서 수행)"""
     
-    def __init__(self, db: Session):
-        self.db = db
+    # ID 목록 문은 클래스 로드 시 1회 구성해 SQLAlchemy 컴파일 캐시와 sqlite3 문 캐시를 재사용
+    # 발권 상태인 티켓만 취소하고 실제로 변경된 ID를 돌려받음
+    _REFUND_ISSUED_STMT = (
+        update(Ticket)
+        .where(_ticket_id_in(), Ticket.status == "issued")
+        .values(status="canceled")
+        .returning(Ticket.id)
+        .execution_options(synchronize_session=False)
+    )
+    _EXISTING_IDS_STMT = select(Ticket.id).where(_ticket_id_in())
     
-    def create(self, ticket: Ticket) -> Ticket:
-        """티켓 생성"""
-        self.db.add(ticket)
-        self.db.commit()
-        self.db.refresh(ticket)
-        return ticket
+    def __init__(self, db: AsyncSession):
+        self.db = db
     
-    def create_many(self, tickets: List[Ticket]) -> List[Ticket]:
-        """여러 티켓 생성"""
-        self.db.add_all(tickets)
-        self.db.commit()
-        for ticket in tickets:
-            self.db.refresh(ticket)
-        return tickets
+    async def bulk_create_tickets(self, rows: List[dict]) -> List[str]:
+        """
+        티켓 행 데이터를 다중 행 INSERT 한 번으로 저장
+        
+        Args:
+            rows: 컬럼명 -> 값 딕셔너리 목록 (id가 없으면 새로 생성)
+        
+        Returns:
+            저장된 티켓 ID 목록
+        """
+        # ID가 없는 행 수만큼 한 번에 생성 (행마다 난수 시스템 콜을 하지 않도록)
+        new_ids = iter(uuid7_many(sum(1 for row in rows if not row.get("id"))))
+        mappings = [row if row.get("id") else {**row, "id": str(next(new_ids))} for row in rows]
+        await self.db.execute(insert(Ticket), mappings)
+        return [mapping["id"] for mapping in mappings]
     
-    def get_by_id(self, ticket_id: str) -> Optional[Ticket]:
-        """ID로 티켓 조회"""
-        return self.db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    async def get_by_id(self, ticket_id: str) -> Optional[Ticket]:
+        """ID로 티켓 조회 (identity map에 있으면 SELECT 없이 반환)"""
+        return await self.db.get(Ticket, ticket_id)
     
-    def get_by_ids(self, ticket_ids: List[str]) -> List[Ticket]:
-        """여러 ID로 티켓 조회"""
-        return self.db.query(Ticket).filter(Ticket.id.in_(ticket_ids)).all()
+    async def get_list(
+        self,
+        theater_name: Optional[str] = None,
+        user_id: Optional[str] = None,
+        movie_title: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        skip_count: bool = False,
+    ) -> tuple[List[Ticket], Optional[int], bool]:
+        """
+        티켓 목록 조회 (필터링 및 페이징)
+        
+        cursor(이전 페이지 마지막 티켓 ID)가 주어지면 offset 대신 키셋 페이지네이션으로 조회하며,
+        이 경우와 skip_count가 True인 경우 전체 개수는 조회하지 않음(None)
+        
+        Returns:
+            (티켓 목록, 전체 개수 또는 None, 다음 페이지 존재 여부)
+        """
+        filters = self._list_filters(
+            theater_name=theater_name,
+            user_id=user_id,
+            movie_title=movie_title,
+            status=status,
+        )
+        
+        # 한 행을 더 읽어 COUNT 없이 다음 페이지 존재 여부를 판단
+        stmt = select(Ticket).where(*filters).order_by(Ticket.id).limit(limit + 1)
+        if cursor is not None:
+            # 키셋 페이지네이션: PK 인덱스로 cursor 다음 위치부터 바로 조회 (OFFSET 스캔 없음)
+            stmt = stmt.where(Ticket.id > cursor)
+        else:
+            stmt = stmt.offset(offset)
+        tickets = list((await self.db.execute(stmt)).scalars().all())
+        has_next = len(tickets) > limit
+        tickets = tickets[:limit]
+        
+        # 커서로 페이지를 넘기거나 개수가 필요 없는 클라이언트는 COUNT 생략
+        if cursor is not None or skip_count:
+            return tickets, None, has_next
+        
+        # 다음 페이지가 없으면 이 페이지가 마지막이므로 전체 개수를 바로 계산
+        # (COUNT(*) OVER ()는 인덱스 순서 조회를 막고 전체 결과를 정렬하므로 사용하지 않음)
+        if not has_next and (tickets or offset == 0):
+            return tickets, offset + len(tickets), has_next
+        
+        count_stmt = select(func.count()).select_from(Ticket).where(*filters)
+        total = (await self.db.execute(count_stmt)).scalar_one()
+        return tickets, total, has_next
     
-    def get_list(
+    async def stream_list(
         self,
         theater_name: Optional[str] = None,
         user_id: Optional[str] = None,
@@ -41,49 +133,124 @@ class TicketRepository:
         status: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> tuple[List[Ticket], int]:
-        """티켓 목록 조회 (필터링 및 페이징)"""
-        query = self.db.query(Ticket)
-        
-        # 필터 적용
-        if theater_name:
-            query = query.filter(Ticket.theater_name == theater_name)
-        if user_id:
-            query = query.filter(Ticket.user_id == user_id)
-        if movie_title:
-            query = query.filter(Ticket.movie_title == movie_title)
-        if status:
-            query = query.filter(Ticket.status == status)
-        
-        # 전체 개수 조회
-        total = query.count()
-        
-        # 페이징 적용
-        tickets = query.limit(limit).offset(offset).all()
-        
-        return tickets, total
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[Ticket]:
+        """
+        티켓 목록을 한 페이지 전체를 메모리에 올리지 않고 순차 조회 (전체 개수는 조회하지 않음)
+        
+        작은 결과에서는 yield_per가 all()보다 느릴 수 있으므로 스트리밍 응답에서만 사용
+        """
+        filters = self._list_filters(
+            theater_name=theater_name,
+            user_id=user_id,
+            movie_title=movie_title,
+            status=status,
+        )
+        stmt = select(Ticket).where(*filters).order_by(Ticket.id).limit(limit)
+        if cursor is not None:
+            stmt = stmt.where(Ticket.id > cursor)
+        else:
+            stmt = stmt.offset(offset)
+        
+        result = await self.db.stream_scalars(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for ticket in result:
+            yield ticket
     
-    def update(self, ticket: Ticket) -> Ticket:
-        """티켓 업데이트"""
-        self.db.commit()
-        self.db.refresh(ticket)
-        return ticket
+    @staticmethod
+    def _list_filters(**values: Optional[str]) -> list:
+        """목록 조회 필터 조건 생성 (값이 있는 필터만 적용)"""
+        return [FILTER_COLS[name] == value for name, value in values.items() if value]
     
-    def update_status(self, ticket_id: str, status: str) -> Optional[Ticket]:
+    async def update_status(self, ticket_id: str, status: str) -> Optional[Ticket]:
         """티켓 상태 업데이트"""
-        ticket = self.get_by_id(ticket_id)
+        ticket = await self.get_by_id(ticket_id)
         if ticket:
             ticket.status = status
-            self.db.commit()
-            self.db.refresh(ticket)
         return ticket
     
-    def update_status_many(self, ticket_ids: List[str], status: str) -> List[Ticket]:
-        """여러 티켓 상태 업데이트"""
-        tickets = self.get_by_ids(ticket_ids)
-        for ticket in tickets:
-            ticket.status = status
-        self.db.commit()
-        for ticket in tickets:
-            self.db.refresh(ticket)
-        return tickets
+    async def refund_many(self, ticket_ids: List[str]) -> Tuple[List[str], List[str], List[str]]:
+        """
+        티켓 일괄 환불 (UPDATE ... RETURNING + 존재 여부 SELECT, 요청 수와 무관하게 최대 2개 쿼리)
+        
+        Args:
+            ticket_ids: 환불할 티켓 ID 목록 (중복 없음, TicketRefundRequest에서 제거됨)
+        
+        Returns:
+            (환불된 ID, 이미 취소된 ID, 존재하지 않는 ID) - 각 목록은 요청 순서 유지
+        """
+        result = await self.db.execute(self._REFUND_ISSUED_STMT, {"ticket_ids": _encode_ids(ticket_ids)})
+        canceled = set(result.scalars().all())
+        
+        # 변경되지 않은 ID만 존재 여부 확인 (모두 환불되었으면 생략)
+        existing = set(canceled)
+        remaining = set(ticket_ids) - canceled
+        if remaining:
+            result = await self.db.execute(self._EXISTING_IDS_STMT, {"ticket_ids": _encode_ids(remaining)})
+            existing.update(result.scalars().all())
+        
+        refunded = []
+        already_canceled = []
+        not_found = []
+        for ticket_id in ticket_ids:
+            if ticket_id not in existing:
+                not_found.append(ticket_id)
+            elif ticket_id in canceled:
+                refunded.append(ticket_id)
+            else:
+                already_canceled.append(ticket_id)
+        return refunded, already_canceled, not_found
+
+
+class RefundJobRepository:
+    """환불 작업 CRUD 작업을 담당하는 리포지토리 (커밋은 호출 측 트랜잭션에서 수행)"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create(self, job: RefundJob) -> RefundJob:
+        """환불 작업 생성"""
+        self.db.add(job)
+        return job
+    
+    async def get_by_id(self, job_id: str) -> Optional[RefundJob]:
+        """ID로 환불 작업 조회"""
+        return await self.db.get(RefundJob, job_id)
+    
+    async def update_status(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> int:
+        """환불 작업 상태/결과 업데이트, 변경된 행 수 반환"""
+        stmt = (
+            update(RefundJob)
+            .where(RefundJob.id == job_id)
+            .values(status=status, result=result, error=error)
+            .execution_options(synchronize_session=False)
+        )
+        result_proxy = await self.db.execute(stmt)
+        return result_proxy.rowcount
+    
+    async def fail_unfinished(self, before_job_id: str, error: str) -> int:
+        """
+        기준 ID보다 먼저 생성된 미완료(accepted | running) 작업을 실패 처리
+        
+        작업 ID는 UUIDv7이므로 ID 순서가 생성 시각 순서와 같음
+        
+        Args:
+            before_job_id: 기준 작업 ID (이 ID보다 작은 작업만 대상)
+            error: 실패 사유
+            
+        Returns:
+            실패 처리된 작업 수
+        """
+        stmt = (
+            update(RefundJob)
+            .where(RefundJob.status.in_(("accepted", "running")), RefundJob.id < before_job_id)
+            .values(status="failed", error=error)
+            .execution_options(synchronize_session=False)
+        )
+        result_proxy = await self.db.execute(stmt)
+        return result_proxy.rowcount
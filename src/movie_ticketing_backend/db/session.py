@@ -1,43 +1,177 @@
 """데이터베이스 세션 설정"""
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 # 데이터베이스 파일 경로
 DB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "data")
 DB_PATH = os.path.join(DB_DIR, "app.db")
-DATABASE_URL = f"sqlite:///{DB_PATH}"
+DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
 
-# 엔진 생성
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # SQLite 멀티스레드 사용
-    echo=False,
+# 연결마다 적용할 SQLite PRAGMA (WAL 저널, 잠금 대기 5초, 메모리 매핑 I/O, 64MB 페이지 캐시)
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
 )
 
-# 세션 팩토리
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 커넥션 풀 크기 (aiosqlite 커넥션마다 스레드가 하나씩 생기므로 초과 커넥션도 작게 제한)
+POOL_SIZE = 20
+MAX_OVERFLOW = 10
+
+# 커넥션별 sqlite3 준비된 문(prepared statement) 캐시 크기 (기본값 128)
+# 같은 SQL 문자열은 재파싱/재계획 없이 컴파일된 문을 재사용
+SQLITE_STATEMENT_CACHE_SIZE = 256
+
+# ANALYZE 시 인덱스당 검사하는 행 수 상한 (근사 통계로 큰 테이블에서도 짧게 끝나도록)
+ANALYZE_ROW_LIMIT = 1000
+
+# 테이블 행 수가 마지막 ANALYZE 시점 대비 이 배수 이상 달라지면 통계를 다시 수집
+ANALYZE_DRIFT_FACTOR = 4
 
 # Base 클래스
 Base = declarative_base()
 
 
-def get_db():
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """새 커넥션이 열릴 때 SQLite PRAGMA 적용"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _begin_sqlite_transaction(conn):
+    """SQLAlchemy 트랜잭션 시작 시 BEGIN 실행 (쓰기 트랜잭션은 BEGIN IMMEDIATE로 시작 시점에 쓰기 잠금 확보)"""
+    if conn.get_execution_options().get("sqlite_begin_immediate"):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    else:
+        conn.exec_driver_sql("BEGIN")
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """프로세스 전역 비동기 엔진 반환 (첫 호출 시 생성)"""
+    engine = create_async_engine(
+        DATABASE_URL,
+        # 드라이버의 암묵적 BEGIN을 끄고 트랜잭션 시작은 begin 이벤트에서만 수행
+        connect_args={"isolation_level": None, "cached_statements": SQLITE_STATEMENT_CACHE_SIZE},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        insertmanyvalues_page_size=1000,
+        # 목록 조회는 필터 조합 x (offset | cursor | 스트리밍) 변형이 많아 기본값(500)보다 크게 잡아 재컴파일 방지
+        query_cache_size=1200,
+        echo=False,
+    )
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    event.listen(engine.sync_engine, "begin", _begin_sqlite_transaction)
+    return engine
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """세션 팩토리 반환 (커밋 후에도 속성 접근 시 lazy load가 발생하지 않도록 expire_on_commit=False)"""
+    return async_sessionmaker(
+        bind=get_engine(),
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def get_db():
     """데이터베이스 세션 의존성"""
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
 
 
-def init_db():
+@asynccontextmanager
+async def write_transaction(db: AsyncSession):
+    """
+    쓰기 트랜잭션 (요청당 한 번의 커밋)
+    
+    BEGIN IMMEDIATE로 시작하여 트랜잭션 중간에 잠금을 올리다 "database is locked"가 발생하지 않도록 하고,
+    블록이 정상 종료되면 커밋, 예외가 발생하면 롤백
+    """
+    async with db.begin():
+        await db.connection(execution_options={"sqlite_begin_immediate": True})
+        yield db
+
+
+async def init_db():
     """데이터베이스 초기화 (테이블 생성)"""
     # data 디렉토리가 없으면 생성
     os.makedirs(DB_DIR, exist_ok=True)
     
     # 모든 엔티티를 import하여 Base.metadata에 등록
-    from movie_ticketing_backend.entity import ticket  # noqa
+    from movie_ticketing_backend.entity import refund_job, ticket  # noqa
+    
+    # 테이블 생성, 기존 테이블에 없는 인덱스 추가 후 필요할 때만 쿼리 플래너 통계 갱신
+    # 여러 워커가 동시에 시작해도 BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡아 busy_timeout 동안 차례로 대기
+    # (BEGIN으로 시작해 읽은 뒤 쓰기 잠금을 올리면 대기 없이 "database is locked"로 실패)
+    async with get_engine().connect() as conn:
+        conn = await conn.execution_options(sqlite_begin_immediate=True)
+        async with conn.begin():
+            await conn.run_sync(Base.metadata.create_all)
+            created = await conn.run_sync(_create_missing_indexes)
+            if created or await conn.run_sync(_needs_analyze):
+                await conn.exec_driver_sql(f"PRAGMA analysis_limit={ANALYZE_ROW_LIMIT}")
+                await conn.exec_driver_sql("ANALYZE")
+
+
+async def warm_up_pool(size: int = POOL_SIZE):
+    """커넥션 풀 예열 (첫 요청에서 커넥션 생성 비용이 발생하지 않도록 미리 연결)"""
+    engine = get_engine()
+    connections = [await engine.connect() for _ in range(size)]
+    for conn in connections:
+        await conn.close()
+
+
+def _create_missing_indexes(conn) -> int:
+    """create_all은 기존 테이블의 인덱스를 만들지 않으므로 누락된 인덱스를 생성, 생성한 인덱스 수 반환"""
+    created = 0
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspect(conn).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=conn)
+                created += 1
+    return created
+
+
+def _needs_analyze(conn) -> bool:
+    """
+    쿼리 플래너 통계를 다시 수집해야 하는지 확인 (워커가 시작할 때마다 ANALYZE하지 않도록)
+    
+    통계가 없거나, 테이블 행 수(max(rowid), 행을 삭제하지 않으므로 행 수와 같음)가
+    마지막 ANALYZE 시점의 행 수와 ANALYZE_DRIFT_FACTOR배 이상 차이 나면 True
+    """
+    has_stats = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).first()
+    if not has_stats:
+        return True
     
-    # 테이블 생성
-    Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        stat = conn.exec_driver_sql(
+            "SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (table.name,)
+        ).scalar()
+        analyzed_rows = int(stat.split()[0]) if stat else 0
+        current_rows = conn.exec_driver_sql(f"SELECT max(rowid) FROM {table.name}").scalar() or 0
+        if current_rows * ANALYZE_DRIFT_FACTOR < analyzed_rows or current_rows > analyzed_rows * ANALYZE_DRIFT_FACTOR:
+            return True
+    return False
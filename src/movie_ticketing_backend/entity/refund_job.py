@@ -0,0 +1,18 @@
+"""환불 작업 ORM 엔티티"""
+from sqlalchemy import Column, String, Text
+from movie_ticketing_backend.db.session import Base
+from movie_ticketing_backend.util.uuid7 import uuid7
+
+
+class RefundJob(Base):
+    """대량 환불 백그라운드 작업 테이블 ORM 모델 (워커 프로세스 간 작업 상태 공유)"""
+    
+    __tablename__ = "refund_jobs"
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid7()))
+    status = Column(String(20), nullable=False, default="accepted")  # accepted | running | succeeded | failed
+    result = Column(Text, nullable=True)  # 환불 결과 JSON (TicketRefundResponse)
+    error = Column(String, nullable=True)
+    
+    def __repr__(self):
+        return f"<RefundJob(id={self.id}, status={self.status})>"
@@ -1,15 +1,25 @@
 """티켓 ORM 엔티티"""
-import uuid
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, Index, String, Integer
 from movie_ticketing_backend.db.session import Base
+from movie_ticketing_backend.util.uuid7 import uuid7
 
 
 class Ticket(Base):
     """티켓 테이블 ORM 모델"""
     
     __tablename__ = "tickets"
+    __table_args__ = (
+        # 목록 조회 필터 조합 + id 정렬을 인덱스 범위 스캔으로 처리
+        Index("ix_tickets_user_status_id", "user_id", "status", "id"),
+        Index("ix_tickets_theater_status_id", "theater_name", "status", "id"),
+        Index("ix_tickets_movie_id", "movie_title", "id"),
+        Index("ix_tickets_movie_status_id", "movie_title", "status", "id"),
+        Index("ix_tickets_status_id", "status", "id"),
+        # 극장별 결과는 수천 건 단위이므로 status 필터 없이 조회할 때도 정렬 없이 id 순으로 페이징
+        Index("ix_tickets_theater_id", "theater_name", "id"),
+    )
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid7()))
     theater_name = Column(String(100), nullable=False)
     user_id = Column(String(100), nullable=False)
     movie_title = Column(String(200), nullable=False)
@@ -0,0 +1,42 @@
+"""Gunicorn 설정 - 운영 환경 멀티 프로세스 실행
+
+실행 예시:
+    gunicorn -c python:movie_ticketing_backend.gunicorn_conf
+"""
+import multiprocessing
+import os
+
+from uvicorn_worker import UvicornWorker
+
+from movie_ticketing_backend.util.boot_marker import set_boot_marker
+from movie_ticketing_backend.util.idempotency import check_worker_count, get_idempotency_backend
+
+
+class UvloopWorker(UvicornWorker):
+    """uvloop + httptools를 명시적으로 사용하는 워커 (미설치 시 asyncio/h11로 조용히 대체되지 않도록 함)"""
+    
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+
+# 앱 팩토리 (create_app 호출 결과를 ASGI 앱으로 사용)
+wsgi_app = "movie_ticketing_backend.app:create_app()"
+
+# 워커마다 uvicorn 이벤트 루프(uvloop + httptools) 실행
+worker_class = "movie_ticketing_backend.gunicorn_conf.UvloopWorker"
+
+# 기본 워커 수: 공유 멱등성 백엔드면 CPU 코어 수, memory 백엔드면 1
+# (memory 백엔드는 워커 프로세스마다 캐시를 따로 보관하므로 2개 이상이면 시작 거부)
+_shared_idempotency = get_idempotency_backend() != "memory"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() if _shared_idempotency else 1))
+check_worker_count(workers)
+
+bind = "0.0.0.0:9000"
+keepalive = 30
+
+# 워커별로 앱을 생성 (SQLAlchemy 엔진을 fork 이후에 만들기 위함)
+preload_app = False
+
+
+def on_starting(server):
+    """마스터 시작 시 1회 실행 - 중단된 환불 작업 판단 기준(마스터 시작 이전 생성 작업)을 워커에 전달"""
+    set_boot_marker()
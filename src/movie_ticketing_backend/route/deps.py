@@ -0,0 +1,11 @@
+"""라우트 공통 의존성"""
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from movie_ticketing_backend.db.session import get_db
+from movie_ticketing_backend.service.ticket_service import TicketService
+
+
+async def get_ticket_service(db: AsyncSession = Depends(get_db)) -> TicketService:
+    """요청 세션에 바인딩된 티켓 서비스 반환 (async def로 선언해 스레드풀을 거치지 않고 이벤트 루프에서 바로 실행)"""
+    return TicketService(db)
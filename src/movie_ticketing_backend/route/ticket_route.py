@@ -1,28 +1,47 @@
 """티켓 REST API 라우트"""
-from typing import Optional
-from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from contextlib import nullcontext
+from typing import Optional, Union
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
-from movie_ticketing_backend.db.session import get_db
-from movie_ticketing_backend.service.ticket_service import TicketService
+from movie_ticketing_backend.route.deps import get_ticket_service
+from movie_ticketing_backend.service.ticket_service import REFUND_SYNC_THRESHOLD, TicketService
+from movie_ticketing_backend.scheme.examples import (
+    ISSUE_TICKET_EXAMPLES,
+    ISSUE_TICKET_RESPONSE_EXAMPLE,
+    REFUND_JOB_RESPONSE_EXAMPLE,
+    REFUND_RESULT_EXAMPLE,
+    REFUND_TICKET_EXAMPLES,
+    TICKET_EXAMPLE,
+    TICKET_LIST_RESPONSE_EXAMPLE,
+    json_example,
+)
 from movie_ticketing_backend.scheme.ticket import (
     TicketIssueRequest,
     TicketIssueResponse,
     TicketRefundRequest,
     TicketRefundResponse,
+    TicketRefundJobResponse,
     TicketResponse,
     TicketListResponse,
 )
-from movie_ticketing_backend.util.idempotency import get_idempotency_cache
+from movie_ticketing_backend.util.idempotency import CONFLICT, IN_PROGRESS, REPLAY, get_idempotency_cache
 
 
 router = APIRouter(prefix="/tickets", tags=["tickets"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
-@router.post("/issue", response_model=TicketIssueResponse, status_code=status.HTTP_201_CREATED)
-def issue_tickets(
-    request: TicketIssueRequest,
-    db: Session = Depends(get_db),
+@router.post(
+    "/issue",
+    response_model=TicketIssueResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: json_example(ISSUE_TICKET_RESPONSE_EXAMPLE)},
+)
+async def issue_tickets(
+    request: TicketIssueRequest = Body(..., openapi_examples=ISSUE_TICKET_EXAMPLES),
+    service: TicketService = Depends(get_ticket_service),
     idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
     """
@@ -37,47 +56,71 @@ def issue_tickets(
     
     멱등성 지원을 위해 `Idempotency-Key` 헤더를 사용할 수 있습니다.
     """
-    service = TicketService(db)
+    # 멱등성 키가 없는 요청은 캐시를 조회하지 않음 (백엔드는 애플리케이션 시작 시 생성/검증됨)
+    cache = get_idempotency_cache() if idempotency_key else None
     
-    # 멱등성 키가 있으면 캐시 확인
-    if idempotency_key:
-        cache = get_idempotency_cache()
-        request_data = request.model_dump()
-        cached = cache.get(idempotency_key, request_data)
-        
-        if cached is not None:
-            is_same, cached_response = cached
-            if is_same:
-                # 동일한 요청이면 캐시된 응답 반환
-                return cached_response
-            else:
+    # 같은 멱등성 키의 동시 요청은 선점 → 발권 → 저장을 순서대로 처리 (모두 캐시 미스로 중복 발권되지 않도록)
+    async with cache.lock(idempotency_key) if idempotency_key else nullcontext():
+        # 멱등성 키가 있으면 발권 전에 키를 선점 (요청 해시는 선점/저장에 한 번만 계산)
+        if idempotency_key:
+            request_hash = request.fingerprint()
+            state, cached_body = await cache.reserve(idempotency_key, request_hash)
+            
+            if state == REPLAY:
+                # 동일한 요청이면 저장해 둔 응답 바이트를 검증/직렬화 없이 그대로 반환
+                return Response(content=cached_body, status_code=status.HTTP_201_CREATED, media_type="application/json")
+            if state == CONFLICT:
                 # 다른 요청이면 충돌
                 raise HTTPException(
                     status_code=status.HTTP_409_CONFLICT,
                     detail="멱등성 키 충돌: 동일한 키로 다른 요청이 이미 처리되었습니다",
                 )
-    
-    # 티켓 발권
-    try:
-        response = service.issue_tickets(request)
+            if state == IN_PROGRESS:
+                # 다른 워커가 같은 요청을 처리 중이면 발권하지 않고 재시도 유도
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="동일한 멱등성 키의 요청이 처리 중입니다. 잠시 후 다시 시도하세요",
+                )
+        
+        # 티켓 발권
+        try:
+            response = await service.issue_tickets(request)
+        except Exception as e:
+            # 발권에 실패하면 선점을 풀어 같은 키로 바로 재시도할 수 있도록 함
+            if idempotency_key:
+                await cache.release(idempotency_key)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"티켓 발권 실패: {str(e)}",
+            )
         
-        # 멱등성 키가 있으면 캐시에 저장
+        # 멱등성 키가 있으면 응답을 한 번만 직렬화해 저장하고 같은 바이트로 응답
+        # (선점이 만료된 사이 다른 워커가 먼저 저장했으면 저장된 응답으로 응답)
         if idempotency_key:
-            cache = get_idempotency_cache()
-            cache.set(idempotency_key, request.model_dump(), response)
+            body = response.model_dump_json().encode()
+            stored_body = await cache.complete(idempotency_key, request_hash, body)
+            return Response(content=stored_body or body, status_code=status.HTTP_201_CREATED, media_type="application/json")
         
         return response
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"티켓 발권 실패: {str(e)}",
-        )
 
 
-@router.post("/refund", response_model=TicketRefundResponse, status_code=status.HTTP_200_OK)
-def refund_tickets(
-    request: TicketRefundRequest,
-    db: Session = Depends(get_db),
+@router.post(
+    "/refund",
+    response_model=Union[TicketRefundResponse, TicketRefundJobResponse],
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": TicketRefundResponse, **json_example(REFUND_RESULT_EXAMPLE)},
+        status.HTTP_202_ACCEPTED: {
+            "model": TicketRefundJobResponse,
+            "description": "대량 환불 작업 접수",
+            **json_example(REFUND_JOB_RESPONSE_EXAMPLE),
+        },
+    },
+)
+async def refund_tickets(
+    response: Response,
+    request: TicketRefundRequest = Body(..., openapi_examples=REFUND_TICKET_EXAMPLES),
+    service: TicketService = Depends(get_ticket_service),
 ):
     """
     티켓 환불
@@ -85,15 +128,19 @@ def refund_tickets(
     - **ticket_ids**: 환불할 티켓 ID 목록
     - **reason**: 환불 사유 (선택)
     
-    응답:
+    응답 (200 OK):
     - **refunded**: 성공적으로 환불된 티켓 ID 목록
     - **already_canceled**: 이미 취소된 티켓 ID 목록
     - **not_found**: 존재하지 않는 티켓 ID 목록
-    """
-    service = TicketService(db)
     
+    티켓이 10개를 초과하면 백그라운드 작업으로 처리하고 `202 Accepted`와 작업 ID를 반환합니다.
+    결과는 `GET /tickets/refund/{job_id}`로 조회합니다.
+    """
     try:
-        return service.refund_tickets(request)
+        if len(request.ticket_ids) > REFUND_SYNC_THRESHOLD:
+            response.status_code = status.HTTP_202_ACCEPTED
+            return await service.enqueue_refund(request)
+        return await service.refund_tickets(request)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -101,37 +148,90 @@ def refund_tickets(
         )
 
 
-@router.get("/{ticket_id}", response_model=TicketResponse, status_code=status.HTTP_200_OK)
-def get_ticket(
+@router.get(
+    "/refund/{job_id}",
+    response_model=TicketRefundJobResponse,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: json_example(REFUND_JOB_RESPONSE_EXAMPLE)},
+)
+async def get_refund_job(
+    job_id: str,
+    service: TicketService = Depends(get_ticket_service),
+):
+    """
+    대량 환불 작업 조회
+    
+    - **job_id**: 환불 작업 ID
+    
+    작업 상태는 accepted → running → succeeded | failed 순으로 변경되며, succeeded이면 `result`에 환불 결과가 포함됩니다.
+    """
+    job = await service.get_refund_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"환불 작업을 찾을 수 없습니다: {job_id}",
+        )
+    
+    return job
+
+
+@router.get(
+    "/{ticket_id}",
+    response_model=TicketResponse,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: json_example(TICKET_EXAMPLE)},
+)
+async def get_ticket(
     ticket_id: str,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    service: TicketService = Depends(get_ticket_service),
 ):
     """
     티켓 단일 조회
     
     - **ticket_id**: 티켓 ID
-    """
-    service = TicketService(db)
     
-    ticket = service.get_ticket(ticket_id)
+    응답에 `ETag`와 `Cache-Control` 헤더를 포함하며, `If-None-Match`가 현재 ETag와 같으면 `304 Not Modified`를 반환합니다.
+    """
+    ticket = await service.get_ticket(ticket_id)
     if ticket is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"티켓을 찾을 수 없습니다: {ticket_id}",
         )
     
+    # 티켓은 환불 시에만 상태가 바뀌므로 ID + 상태로 ETag 생성
+    headers = {
+        "ETag": f'W/"{ticket.id}-{ticket.status}"',
+        # 취소된 티켓은 더 이상 변경되지 않으므로 오래 캐싱
+        "Cache-Control": f"private, max-age={3600 if ticket.status == 'canceled' else 30}",
+    }
+    if if_none_match is not None and headers["ETag"] in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
     return ticket
 
 
-@router.get("", response_model=TicketListResponse, status_code=status.HTTP_200_OK)
-def get_ticket_list(
+@router.get(
+    "",
+    response_model=TicketListResponse,
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: json_example(TICKET_LIST_RESPONSE_EXAMPLE)},
+)
+async def get_ticket_list(
     theater_name: Optional[str] = Query(None, description="극장명 필터"),
     user_id: Optional[str] = Query(None, description="사용자 ID 필터"),
     movie_title: Optional[str] = Query(None, description="영화명 필터"),
     status_filter: Optional[str] = Query(None, alias="status", description="상태 필터 (issued | canceled)"),
     limit: int = Query(100, ge=1, le=1000, description="페이지 크기 (최대 1000)"),
     offset: int = Query(0, ge=0, description="페이지 오프셋"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 offset 무시)"),
+    skip_count: bool = Query(False, description="전체 개수(total) 조회 생략 여부"),
+    stream: bool = Query(False, description="NDJSON 스트리밍 응답 여부"),
+    accept: Optional[str] = Header(None),
+    service: TicketService = Depends(get_ticket_service),
 ):
     """
     티켓 목록 조회
@@ -144,17 +244,34 @@ def get_ticket_list(
     - **status**: 상태 필터 (issued | canceled, 선택)
     - **limit**: 페이지 크기 (1~1000, 기본값: 100)
     - **offset**: 페이지 오프셋 (기본값: 0)
+    - **cursor**: 다음 페이지 커서 (선택, 이전 응답의 `next_cursor`). 지정하면 offset 대신 키셋 페이지네이션을 사용하며, 전체 개수(`total`)는 `null`로 반환됩니다.
+    - **skip_count**: `true`이면 전체 개수를 계산하지 않고 `total`을 `null`로 반환합니다 (기본값: false).
+    - **stream**: `true`이거나 `Accept: application/x-ndjson`이면 티켓을 한 줄에 하나씩 NDJSON으로 스트리밍합니다 (전체 개수 없음).
     """
-    service = TicketService(db)
+    if stream or (accept is not None and NDJSON_MEDIA_TYPE in accept):
+        return StreamingResponse(
+            service.stream_ticket_list(
+                theater_name=theater_name,
+                user_id=user_id,
+                movie_title=movie_title,
+                status=status_filter,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
     
     try:
-        return service.get_ticket_list(
+        return await service.get_ticket_list(
             theater_name=theater_name,
             user_id=user_id,
             movie_title=movie_title,
             status=status_filter,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            skip_count=skip_count,
         )
     except Exception as e:
         raise HTTPException(
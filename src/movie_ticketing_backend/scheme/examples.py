@@ -0,0 +1,82 @@
+"""티켓 API OpenAPI 예시
+
+스키마 모델에는 예시를 두지 않고, 라우트에서 요청 본문(Body.openapi_examples)과
+응답(responses)에 연결해 /openapi.json 생성 시에만 사용
+"""
+from typing import Any, Dict
+
+
+TICKET_EXAMPLE = {
+    "id": "abc123",
+    "theater_name": "CGV 강남",
+    "user_id": "user123",
+    "movie_title": "인터스텔라",
+    "price_krw": 15000,
+    "status": "issued",
+    "memo": "VIP석",
+}
+
+REFUND_RESULT_EXAMPLE = {
+    "refunded": ["abc123"],
+    "already_canceled": ["def456"],
+    "not_found": [],
+}
+
+
+# 요청 본문 예시 (Body(openapi_examples=...))
+ISSUE_TICKET_EXAMPLES = {
+    "default": {
+        "summary": "티켓 2매 발권",
+        "value": {
+            "theater_name": "CGV 강남",
+            "user_id": "user123",
+            "movie_title": "인터스텔라",
+            "price_krw": 15000,
+            "quantity": 2,
+            "memo": "VIP석",
+        },
+    },
+}
+
+REFUND_TICKET_EXAMPLES = {
+    "default": {
+        "summary": "티켓 환불",
+        "value": {
+            "ticket_ids": ["abc123", "def456"],
+            "reason": "고객 요청",
+        },
+    },
+}
+
+
+# 응답 본문 예시 (responses={status: json_example(...)})
+ISSUE_TICKET_RESPONSE_EXAMPLE = {
+    "ticket_ids": ["abc123", "def456"],
+    "count": 2,
+    "summary": {
+        "theater_name": "CGV 강남",
+        "movie_title": "인터스텔라",
+        "price_krw": 15000,
+    },
+}
+
+REFUND_JOB_RESPONSE_EXAMPLE = {
+    "job_id": "9f1c2d3e-0000-4000-8000-000000000000",
+    "status": "accepted",
+    "result": None,
+    "error": None,
+}
+
+TICKET_LIST_RESPONSE_EXAMPLE = {
+    "tickets": [TICKET_EXAMPLE],
+    "total": 1,
+    "limit": 10,
+    "offset": 0,
+    "has_next": False,
+    "next_cursor": None,
+}
+
+
+def json_example(value: Any) -> Dict[str, Any]:
+    """라우트 responses 항목에 넣을 application/json 예시 생성"""
+    return {"content": {"application/json": {"example": value}}}
@@ -1,6 +1,11 @@
 """티켓 Pydantic 스키마"""
-from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator
+from typing import ClassVar, FrozenSet, List, Optional
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+from movie_ticketing_backend.util.idempotency import fingerprint as hash_request
+
+
+# 환불 요청 1건에 허용하는 최대 티켓 ID 수 (중복 포함, 본문 전체를 처리하기 전에 길이로 거절)
+MAX_REFUND_BATCH = 500
 
 
 class TicketIssueRequest(BaseModel):
@@ -13,20 +18,14 @@ class TicketIssueRequest(BaseModel):
     quantity: int = Field(1, ge=1, le=10, description="수량")
     memo: Optional[str] = Field(None, description="메모")
     
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "theater_name": "CGV 강남",
-                    "user_id": "user123",
-                    "movie_title": "인터스텔라",
-                    "price_krw": 15000,
-                    "quantity": 2,
-                    "memo": "VIP석"
-                }
-            ]
-        }
-    }
+    # 멱등성 판단에 사용하는 필드 (이후 추가되는 메타데이터 필드는 요청 해시에 영향을 주지 않음)
+    IDEMPOTENCY_FIELDS: ClassVar[FrozenSet[str]] = frozenset(
+        {"theater_name", "user_id", "movie_title", "price_krw", "quantity", "memo"}
+    )
+    
+    def fingerprint(self) -> bytes:
+        """멱등성 필드만 JSON으로 직렬화해 요청 해시 생성 (dict 변환 없이 pydantic-core에서 바로 직렬화)"""
+        return hash_request(self.model_dump_json(include=self.IDEMPOTENCY_FIELDS, exclude_none=True).encode())
 
 
 class TicketIssueSummary(BaseModel):
@@ -43,28 +42,12 @@ class TicketIssueResponse(BaseModel):
     ticket_ids: List[str] = Field(..., description="생성된 티켓 ID 목록")
     count: int = Field(..., description="생성된 티켓 수")
     summary: TicketIssueSummary = Field(..., description="발권 요약")
-    
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "ticket_ids": ["abc123", "def456"],
-                    "count": 2,
-                    "summary": {
-                        "theater_name": "CGV 강남",
-                        "movie_title": "인터스텔라",
-                        "price_krw": 15000
-                    }
-                }
-            ]
-        }
-    }
 
 
 class TicketRefundRequest(BaseModel):
     """티켓 환불 요청 스키마"""
     
-    ticket_ids: List[str] = Field(..., min_length=1, description="환불할 티켓 ID 목록")
+    ticket_ids: List[str] = Field(..., min_length=1, max_length=MAX_REFUND_BATCH, description="환불할 티켓 ID 목록")
     reason: Optional[str] = Field(None, description="환불 사유")
     
     @field_validator("ticket_ids")
@@ -72,18 +55,8 @@ class TicketRefundRequest(BaseModel):
     def validate_ticket_ids(cls, v: List[str]) -> List[str]:
         if not v:
             raise ValueError("ticket_ids는 비어있을 수 없습니다")
-        return v
-    
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "ticket_ids": ["abc123", "def456"],
-                    "reason": "고객 요청"
-                }
-            ]
-        }
-    }
+        # 재시도 클라이언트가 보낸 중복 ID는 처음 등장한 순서대로 하나만 남김
+        return list(dict.fromkeys(v))
 
 
 class TicketRefundResponse(BaseModel):
@@ -92,18 +65,15 @@ class TicketRefundResponse(BaseModel):
     refunded: List[str] = Field(..., description="환불된 티켓 ID 목록")
     already_canceled: List[str] = Field(..., description="이미 취소된 티켓 ID 목록")
     not_found: List[str] = Field(..., description="찾을 수 없는 티켓 ID 목록")
+
+
+class TicketRefundJobResponse(BaseModel):
+    """티켓 대량 환불 작업 응답 스키마"""
     
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "refunded": ["abc123"],
-                    "already_canceled": ["def456"],
-                    "not_found": []
-                }
-            ]
-        }
-    }
+    job_id: str = Field(..., description="환불 작업 ID")
+    status: str = Field(..., description="작업 상태 (accepted | running | succeeded | failed)")
+    result: Optional[TicketRefundResponse] = Field(None, description="환불 결과 (succeeded 상태에서만 존재)")
+    error: Optional[str] = Field(None, description="실패 사유 (failed 상태에서만 존재)")
 
 
 class TicketResponse(BaseModel):
@@ -117,51 +87,22 @@ class TicketResponse(BaseModel):
     status: str = Field(..., description="상태 (issued | canceled)")
     memo: Optional[str] = Field(None, description="메모")
     
-    model_config = {
-        "from_attributes": True,
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "id": "abc123",
-                    "theater_name": "CGV 강남",
-                    "user_id": "user123",
-                    "movie_title": "인터스텔라",
-                    "price_krw": 15000,
-                    "status": "issued",
-                    "memo": "VIP석"
-                }
-            ]
-        }
-    }
+    # 응답 전용 모델은 생성 후 변경하지 않으므로 불변(frozen)으로 고정 (캐시 공유에도 안전)
+    model_config = {"from_attributes": True, "frozen": True}
+
+
+# ORM 티켓 목록을 한 번의 검증 호출로 변환하기 위한 어댑터 (모듈 로드 시 1회 생성)
+TicketResponseListAdapter = TypeAdapter(List[TicketResponse])
 
 
 class TicketListResponse(BaseModel):
     """티켓 목록 응답 스키마"""
     
     tickets: List[TicketResponse] = Field(..., description="티켓 목록")
-    total: int = Field(..., description="전체 티켓 수")
+    total: Optional[int] = Field(None, description="전체 티켓 수 (cursor 조회 시 null)")
     limit: int = Field(..., description="페이지 크기")
     offset: int = Field(..., description="페이지 오프셋")
+    has_next: bool = Field(False, description="다음 페이지 존재 여부")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
     
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "tickets": [
-                        {
-                            "id": "abc123",
-                            "theater_name": "CGV 강남",
-                            "user_id": "user123",
-                            "movie_title": "인터스텔라",
-                            "price_krw": 15000,
-                            "status": "issued",
-                            "memo": "VIP석"
-                        }
-                    ],
-                    "total": 1,
-                    "limit": 10,
-                    "offset": 0
-                }
-            ]
-        }
-    }
+    model_config = {"frozen": True}
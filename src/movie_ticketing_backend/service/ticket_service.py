@@ -1,28 +1,48 @@
 """티켓 비즈니스 로직 서비스"""
-import uuid
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
+import asyncio
+from typing import AsyncIterator, List, Optional, Set, Tuple
 
-from movie_ticketing_backend.db.repository import TicketRepository
-from movie_ticketing_backend.entity.ticket import Ticket
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from movie_ticketing_backend.db.repository import RefundJobRepository, TicketRepository
+from movie_ticketing_backend.db.session import get_sessionmaker, write_transaction
+from movie_ticketing_backend.entity.refund_job import RefundJob
 from movie_ticketing_backend.scheme.ticket import (
     TicketIssueRequest,
     TicketIssueResponse,
     TicketIssueSummary,
     TicketRefundRequest,
     TicketRefundResponse,
+    TicketRefundJobResponse,
     TicketResponse,
     TicketListResponse,
+    TicketResponseListAdapter,
 )
+from movie_ticketing_backend.util.boot_marker import get_boot_marker
+from movie_ticketing_backend.util.ticket_cache import get_ticket_cache
+from movie_ticketing_backend.util.uuid7 import uuid7
+
+# 이 개수를 초과하는 환불 요청은 백그라운드 작업으로 처리
+REFUND_SYNC_THRESHOLD = 10
+
+# 재시작으로 중단된 환불 작업에 기록하는 실패 사유
+INTERRUPTED_JOB_ERROR = "서버 재시작으로 작업이 중단되었습니다. 다시 요청하세요 (이미 환불된 티켓은 already_canceled로 분류됩니다)"
+
+# 실행 중인 백그라운드 환불 태스크 (GC로 취소되지 않도록 참조 유지, 종료 시 대기)
+_refund_tasks: Set[asyncio.Task] = set()
 
 
 class TicketService:
     """티켓 비즈니스 로직을 담당하는 서비스"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
+        self.db = db
         self.repository = TicketRepository(db)
+        self.job_repository = RefundJobRepository(db)
+        self.cache = get_ticket_cache()
     
-    def issue_tickets(self, request: TicketIssueRequest) -> TicketIssueResponse:
+    async def issue_tickets(self, request: TicketIssueRequest) -> TicketIssueResponse:
         """
         티켓 발권
         
@@ -32,35 +52,33 @@ class TicketService:
         Returns:
             발권 응답
         """
-        # 티켓 엔티티 생성
-        tickets = []
-        for _ in range(request.quantity):
-            ticket = Ticket(
-                id=str(uuid.uuid4()),
-                theater_name=request.theater_name,
-                user_id=request.user_id,
-                movie_title=request.movie_title,
-                price_krw=request.price_krw,
-                status="issued",
-                memo=request.memo,
-            )
-            tickets.append(ticket)
+        # 티켓 행 데이터 (수량만큼 동일한 행, ID는 리포지토리에서 생성)
+        row = {
+            "theater_name": request.theater_name,
+            "user_id": request.user_id,
+            "movie_title": request.movie_title,
+            "price_krw": request.price_krw,
+            "status": "issued",
+            "memo": request.memo,
+        }
         
-        # 데이터베이스에 저장
-        created_tickets = self.repository.create_many(tickets)
+        # 데이터베이스에 저장 (단일 쓰기 트랜잭션, 다중 행 INSERT 한 번)
+        async with write_transaction(self.db):
+            ticket_ids = await self.repository.bulk_create_tickets([row] * request.quantity)
         
         # 응답 생성
-        return TicketIssueResponse(
-            ticket_ids=[ticket.id for ticket in created_tickets],
-            count=len(created_tickets),
-            summary=TicketIssueSummary(
+        # 서비스가 만든 값이므로 검증 없이 응답 모델 구성
+        return TicketIssueResponse.model_construct(
+            ticket_ids=ticket_ids,
+            count=len(ticket_ids),
+            summary=TicketIssueSummary.model_construct(
                 theater_name=request.theater_name,
                 movie_title=request.movie_title,
                 price_krw=request.price_krw,
             ),
         )
     
-    def refund_tickets(self, request: TicketRefundRequest) -> TicketRefundResponse:
+    async def refund_tickets(self, request: TicketRefundRequest) -> TicketRefundResponse:
         """
         티켓 환불
         
@@ -70,40 +88,63 @@ class TicketService:
         Returns:
             환불 응답
         """
-        # 티켓 조회
-        tickets = self.repository.get_by_ids(request.ticket_ids)
-        ticket_map = {ticket.id: ticket for ticket in tickets}
-        
-        refunded = []
-        already_canceled = []
-        not_found = []
-        
-        # 각 티켓 처리
-        for ticket_id in request.ticket_ids:
-            if ticket_id not in ticket_map:
-                # 존재하지 않는 티켓
-                not_found.append(ticket_id)
-            else:
-                ticket = ticket_map[ticket_id]
-                if ticket.status == "canceled":
-                    # 이미 취소된 티켓
-                    already_canceled.append(ticket_id)
-                elif ticket.status == "issued":
-                    # 환불 가능한 티켓
-                    ticket.status = "canceled"
-                    refunded.append(ticket_id)
-        
-        # 환불된 티켓 업데이트
-        if refunded:
-            self.repository.update_status_many(refunded, "canceled")
-        
-        return TicketRefundResponse(
+        # 환불과 분류를 하나의 쓰기 트랜잭션으로 처리 (동시 환불 시 중복 환불 방지)
+        async with write_transaction(self.db):
+            refunded, already_canceled, not_found = await self.repository.refund_many(request.ticket_ids)
+        
+        # 커밋 후 캐시 무효화
+        self.cache.invalidate(refunded)
+        
+        return TicketRefundResponse.model_construct(
             refunded=refunded,
             already_canceled=already_canceled,
             not_found=not_found,
         )
     
-    def get_ticket(self, ticket_id: str) -> Optional[TicketResponse]:
+    async def enqueue_refund(self, request: TicketRefundRequest) -> TicketRefundJobResponse:
+        """
+        대량 티켓 환불 작업 등록
+        
+        작업 레코드를 저장한 뒤 요청 처리와 분리된 백그라운드 태스크에서 환불을 수행
+        
+        Args:
+            request: 환불 요청
+            
+        Returns:
+            등록된 환불 작업 응답
+        """
+        job = RefundJob(id=str(uuid7()), status="accepted")
+        async with write_transaction(self.db):
+            await self.job_repository.create(job)
+        
+        task = asyncio.create_task(_run_refund_job(job.id, request))
+        _refund_tasks.add(task)
+        task.add_done_callback(_refund_tasks.discard)
+        
+        return TicketRefundJobResponse.model_construct(job_id=job.id, status=job.status)
+    
+    async def get_refund_job(self, job_id: str) -> Optional[TicketRefundJobResponse]:
+        """
+        환불 작업 조회
+        
+        Args:
+            job_id: 환불 작업 ID
+            
+        Returns:
+            환불 작업 응답 또는 None
+        """
+        job = await self.job_repository.get_by_id(job_id)
+        if job is None:
+            return None
+        
+        return TicketRefundJobResponse(
+            job_id=job.id,
+            status=job.status,
+            result=TicketRefundResponse.model_validate_json(job.result) if job.result else None,
+            error=job.error,
+        )
+    
+    async def get_ticket(self, ticket_id: str) -> Optional[TicketResponse]:
         """
         티켓 단일 조회
         
@@ -113,13 +154,20 @@ class TicketService:
         Returns:
             티켓 응답 또는 None
         """
-        ticket = self.repository.get_by_id(ticket_id)
+        # 캐시에 있으면 DB 조회 생략
+        cached = self.cache.get(ticket_id)
+        if cached is not None:
+            return cached
+        
+        ticket = await self.repository.get_by_id(ticket_id)
         if ticket is None:
             return None
         
-        return TicketResponse.model_validate(ticket)
+        response = TicketResponse.model_validate(ticket)
+        self.cache.set(ticket_id, response)
+        return response
     
-    def get_ticket_list(
+    async def get_ticket_list(
         self,
         theater_name: Optional[str] = None,
         user_id: Optional[str] = None,
@@ -127,6 +175,8 @@ class TicketService:
         status: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
+        skip_count: bool = False,
     ) -> TicketListResponse:
         """
         티켓 목록 조회
@@ -138,22 +188,103 @@ class TicketService:
             status: 상태 필터
             limit: 페이지 크기
             offset: 페이지 오프셋
+            cursor: 키셋 페이지네이션 커서 (지정 시 offset 무시)
+            skip_count: 전체 개수 조회 생략 여부
             
         Returns:
             티켓 목록 응답
         """
-        tickets, total = self.repository.get_list(
+        tickets, total, has_next = await self.repository.get_list(
             theater_name=theater_name,
             user_id=user_id,
             movie_title=movie_title,
             status=status,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            skip_count=skip_count,
         )
         
-        return TicketListResponse(
-            tickets=[TicketResponse.model_validate(ticket) for ticket in tickets],
+        # 다음 페이지가 있으면 마지막 티켓 ID를 다음 페이지 커서로 반환
+        next_cursor = tickets[-1].id if has_next else None
+        
+        return TicketListResponse.model_construct(
+            tickets=TicketResponseListAdapter.validate_python(tickets, from_attributes=True),
             total=total,
             limit=limit,
-            offset=offset,
+            offset=0 if cursor is not None else offset,
+            has_next=has_next,
+            next_cursor=next_cursor,
         )
+    
+    async def stream_ticket_list(
+        self,
+        theater_name: Optional[str] = None,
+        user_id: Optional[str] = None,
+        movie_title: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        티켓 목록을 NDJSON(한 줄에 티켓 하나)으로 스트리밍
+        
+        응답 전송 중에도 조회가 계속되므로 요청 세션과 별도의 세션을 사용
+        
+        Yields:
+            티켓 JSON 한 줄 (개행 포함)
+        """
+        async with get_sessionmaker()() as db:
+            repository = TicketRepository(db)
+            async for ticket in repository.stream_list(
+                theater_name=theater_name,
+                user_id=user_id,
+                movie_title=movie_title,
+                status=status,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+            ):
+                yield orjson.dumps(TicketResponse.model_validate(ticket).model_dump()) + b"\n"
+
+
+async def _run_refund_job(job_id: str, request: TicketRefundRequest) -> None:
+    """백그라운드 환불 작업 실행 (요청 세션과 별도의 세션 사용)"""
+    async with get_sessionmaker()() as db:
+        service = TicketService(db)
+        async with write_transaction(db):
+            await service.job_repository.update_status(job_id, "running")
+        
+        try:
+            response = await service.refund_tickets(request)
+        except Exception as e:
+            status, result, error = "failed", None, str(e)
+        else:
+            status, result, error = "succeeded", response.model_dump_json(), None
+        
+        async with write_transaction(db):
+            await service.job_repository.update_status(job_id, status, result=result, error=error)
+
+
+async def fail_interrupted_refund_jobs() -> int:
+    """
+    서버 시작 전에 생성되어 끝나지 못한 환불 작업을 실패 처리 (애플리케이션 시작 시 호출)
+    
+    환불 작업은 프로세스 내 태스크로만 실행되므로 크래시/재시작 시 accepted | running 상태로 남음.
+    기준은 서버 시작 시각의 UUIDv7이며, Gunicorn에서는 마스터가 정한 기준을 사용해
+    재시작된 워커가 다른 워커에서 실행 중인 작업을 실패 처리하지 않도록 함
+    
+    Returns:
+        실패 처리된 작업 수
+    """
+    boot_marker = get_boot_marker()
+    async with get_sessionmaker()() as db:
+        async with write_transaction(db):
+            return await RefundJobRepository(db).fail_unfinished(boot_marker, INTERRUPTED_JOB_ERROR)
+
+
+async def wait_refund_jobs() -> None:
+    """진행 중인 백그라운드 환불 작업이 끝날 때까지 대기 (애플리케이션 종료 시 호출)"""
+    if _refund_tasks:
+        await asyncio.gather(*_refund_tasks, return_exceptions=True)
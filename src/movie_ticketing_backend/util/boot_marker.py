@@ -0,0 +1,32 @@
+"""서버 시작 기준(boot marker) 유틸리티
+
+Gunicorn 마스터가 앱 전체를 import하지 않도록 표준 라이브러리와 uuid7만 사용
+"""
+import os
+
+from movie_ticketing_backend.util.uuid7 import uuid7
+
+# 서버 시작 시각 기준 작업 ID를 담는 환경 변수 (Gunicorn 마스터가 설정해 모든 워커가 같은 기준 사용)
+REFUND_JOB_BOOT_MARKER_ENV = "REFUND_JOB_BOOT_MARKER"
+
+
+def set_boot_marker() -> str:
+    """
+    현재 시각의 UUIDv7을 boot marker로 환경 변수에 설정 (이후 fork/spawn되는 워커에 상속됨)
+
+    Returns:
+        설정된 boot marker
+    """
+    marker = str(uuid7())
+    os.environ[REFUND_JOB_BOOT_MARKER_ENV] = marker
+    return marker
+
+
+def get_boot_marker() -> str:
+    """
+    설정된 boot marker 조회 (설정되지 않았으면 현재 시각 기준으로 생성)
+    
+    Returns:
+        boot marker (이보다 작은 ID의 작업은 서버 시작 이전에 생성된 작업)
+    """
+    return os.getenv(REFUND_JOB_BOOT_MARKER_ENV) or str(uuid7())
@@ -1,69 +1,370 @@
 """멱등성 캐시 유틸리티"""
+import asyncio
 import hashlib
-import json
-from typing import Dict, Optional, Tuple, Any
+import heapq
+import os
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+# 멱등성 키 보관 기간 (초)
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+
+# Redis 백엔드에서 발권 처리 중 키 선점 유지 시간 (초)
+# 처리 중인 워커가 죽어도 이 시간이 지나면 같은 키로 다시 발권할 수 있음
+IDEMPOTENCY_PENDING_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_PENDING_TTL_SECONDS", "30"))
+
+# 메모리 백엔드 최대 항목 수 (초과 시 가장 오래 사용되지 않은 키부터 제거)
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "100000"))
+
+# 요청 해시 길이 (blake2b digest_size)
+_HASH_SIZE = 16
+
+# 키별 잠금 샤드 수 (2의 거듭제곱)
+_LOCK_SHARDS = 64
+
+# reserve 결과 상태
+RESERVED = "reserved"  # 키를 선점함: 발권 후 complete, 실패 시 release 호출
+REPLAY = "replay"  # 동일한 요청의 저장된 응답 있음
+CONFLICT = "conflict"  # 같은 키로 다른 요청이 처리됨
+IN_PROGRESS = "in_progress"  # 같은 요청을 다른 워커가 처리 중
+
+
+def fingerprint(request_json: bytes) -> bytes:
+    """
+    요청 본문 JSON의 해시(16바이트)를 생성
+    
+    요청마다 한 번만 계산해 캐시 조회/저장에 그대로 전달
+    (같은 스키마의 모델 직렬화는 필드 순서가 고정되므로 키 정렬 불필요)
+    """
+    return hashlib.blake2b(request_json, digest_size=_HASH_SIZE).digest()
+
+
+class _ShardedLocks:
+    """멱등성 키를 샤드로 나눠 키마다 asyncio.Lock을 배정 (서로 다른 키는 대부분 다른 잠금 사용)"""
+    
+    def __init__(self, shards: int = _LOCK_SHARDS):
+        self._locks = [asyncio.Lock() for _ in range(shards)]
+        self._mask = shards - 1
+    
+    def get(self, key: str) -> asyncio.Lock:
+        """키가 속한 샤드의 잠금 반환"""
+        return self._locks[hash(key) & self._mask]
 
 
 class IdempotencyCache:
-    """멱등성 키를 기반으로 요청/응답을 캐싱하는 클래스"""
+    """멱등성 키를 기반으로 요청/응답을 캐싱하는 클래스 (워커 프로세스 메모리)"""
+    
+    def __init__(
+        self,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        max_entries: int = IDEMPOTENCY_MAX_ENTRIES,
+    ):
+        # 항목마다 컨테이너를 두지 않고 키별 값을 필드별 dict에 나눠 저장 (OrderedDict + 튜플 대비 항목당 메모리 감소)
+        # 요청 본문은 보관하지 않고 16바이트 해시만 저장
+        self._hashes: Dict[str, bytes] = {}
+        # 응답은 직렬화된 JSON 바이트로 보관해 재시도 시 검증/직렬화 없이 그대로 전송
+        self._responses: Dict[str, bytes] = {}
+        # 만료 시각, dict 삽입 순서를 LRU 순서로 사용 (조회 시 다시 삽입해 끝으로 이동)
+        self._expires: Dict[str, float] = {}
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        # (expires_at, key) 최소 힙: 만료된 항목만 꺼내 정리 (전체 순회 없음)
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # 크기 제한으로 제거된 항목 수 (관측용)
+        self.evictions = 0
+        self._locks = _ShardedLocks()
     
-    def __init__(self):
-        # key: idempotency_key, value: (request_hash, response)
-        self._cache: Dict[str, Tuple[str, Any]] = {}
+    def lock(self, idempotency_key: str) -> asyncio.Lock:
+        """같은 키의 조회 → 처리 → 저장을 직렬화하기 위한 잠금 반환"""
+        return self._locks.get(idempotency_key)
     
-    def _hash_request(self, request_data: dict) -> str:
-        """요청 데이터의 해시를 생성"""
-        # 정렬된 JSON 문자열로 변환하여 일관된 해시 생성
-        request_json = json.dumps(request_data, sort_keys=True)
-        return hashlib.sha256(request_json.encode()).hexdigest()
+    def _cleanup_expired(self, now: float) -> None:
+        """만료 시각이 지난 항목 제거 (덮어쓴 키는 현재 항목의 만료 시각이 같을 때만 삭제)"""
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            if self._expires.get(key) == expires_at:
+                self._remove(key)
     
-    def get(self, idempotency_key: str, request_data: dict) -> Optional[Tuple[bool, Any]]:
+    def _remove(self, key: str) -> None:
+        """세 필드 dict에서 키 제거"""
+        del self._expires[key]
+        del self._hashes[key]
+        del self._responses[key]
+    
+    async def get(self, idempotency_key: str, request_hash: bytes) -> Optional[Tuple[bool, Optional[bytes]]]:
         """
         캐시에서 응답을 조회
         
         Args:
             idempotency_key: 멱등성 키
-            request_data: 요청 데이터
+            request_hash: 요청 해시 (fingerprint 결과)
             
         Returns:
-            - (True, response): 동일한 요청이면 캐시된 응답 반환
+            - (True, response_body): 동일한 요청이면 캐시된 응답 JSON 바이트 반환
             - (False, None): 다른 요청이면 충돌
             - None: 캐시에 없음
         """
-        if idempotency_key not in self._cache:
+        expires_at = self._expires.get(idempotency_key)
+        if expires_at is None:
             return None
         
-        cached_hash, cached_response = self._cache[idempotency_key]
-        request_hash = self._hash_request(request_data)
+        if expires_at <= time.monotonic():
+            # 만료된 항목은 없는 것으로 처리 (제거는 힙 정리에서 수행)
+            return None
         
         # 동일한 요청인지 확인
-        if cached_hash == request_hash:
-            return (True, cached_response)
+        if self._hashes[idempotency_key] == request_hash:
+            self._expires[idempotency_key] = self._expires.pop(idempotency_key)
+            return (True, self._responses[idempotency_key])
         else:
             # 다른 요청이면 충돌
             return (False, None)
     
-    def set(self, idempotency_key: str, request_data: dict, response: Any) -> None:
+    async def set(self, idempotency_key: str, request_hash: bytes, response_body: bytes) -> None:
         """
         캐시에 응답을 저장
         
         Args:
             idempotency_key: 멱등성 키
-            request_data: 요청 데이터
-            response: 응답 데이터
+            request_hash: 요청 해시 (fingerprint 결과)
+            response_body: 직렬화된 응답 JSON 바이트
         """
-        request_hash = self._hash_request(request_data)
-        self._cache[idempotency_key] = (request_hash, response)
+        now = time.monotonic()
+        self._cleanup_expired(now)
+        
+        expires_at = now + self._ttl_seconds
+        self._expires.pop(idempotency_key, None)
+        self._expires[idempotency_key] = expires_at
+        self._hashes[idempotency_key] = request_hash
+        self._responses[idempotency_key] = response_body
+        heapq.heappush(self._expiry_heap, (expires_at, idempotency_key))
+        
+        while len(self._expires) > self._max_entries:
+            self._remove(next(iter(self._expires)))
+            self.evictions += 1
+        
+        # 제거/덮어쓴 키의 힙 항목이 쌓이면 현재 항목 기준으로 힙을 다시 구성
+        if len(self._expiry_heap) > 2 * self._max_entries:
+            self._expiry_heap = [(expires_at, key) for key, expires_at in self._expires.items()]
+            heapq.heapify(self._expiry_heap)
+    
+    async def reserve(self, idempotency_key: str, request_hash: bytes) -> Tuple[str, Optional[bytes]]:
+        """
+        발권 전에 키 상태 확인
+        
+        같은 키의 요청은 lock()으로 직렬화되므로 별도의 선점 표시 없이 조회 결과만 반환
+        
+        Args:
+            idempotency_key: 멱등성 키
+            request_hash: 요청 해시 (fingerprint 결과)
+            
+        Returns:
+            (RESERVED, None) | (REPLAY, response_body) | (CONFLICT, None)
+        """
+        cached = await self.get(idempotency_key, request_hash)
+        if cached is None:
+            return (RESERVED, None)
+        is_same, cached_body = cached
+        return (REPLAY, cached_body) if is_same else (CONFLICT, None)
+    
+    async def complete(self, idempotency_key: str, request_hash: bytes, response_body: bytes) -> Optional[bytes]:
+        """발권 응답 저장 (먼저 저장된 응답이 없으므로 항상 None 반환)"""
+        await self.set(idempotency_key, request_hash, response_body)
+        return None
+    
+    async def release(self, idempotency_key: str) -> None:
+        """발권 실패 시 선점 해제 (메모리 백엔드는 선점 표시가 없음)"""
     
-    def clear(self) -> None:
+    async def clear(self) -> None:
         """캐시 초기화"""
-        self._cache.clear()
+        self._expires.clear()
+        self._hashes.clear()
+        self._responses.clear()
+        self._expiry_heap.clear()
+    
+    async def close(self) -> None:
+        """리소스 정리 (메모리 캐시는 정리할 연결이 없음)"""
 
 
-# 전역 캐시 인스턴스
-_idempotency_cache = IdempotencyCache()
+class RedisIdempotencyCache:
+    """Redis에 요청 해시와 응답을 저장하는 멱등성 캐시 (워커/인스턴스 간 공유)
+    
+    발권 전에 `요청 해시 + 선점 표시`를 SET NX로 저장해 키를 선점하고, 발권 후 `요청 해시 + 응답 JSON`으로 교체.
+    조회와 선점/교체/해제는 Lua 스크립트로 원자적으로 수행하므로 여러 워커가 같은 키를 동시에 받아도
+    한 워커만 발권하며, 나머지는 처리 중(IN_PROGRESS) 또는 저장된 응답(REPLAY)을 받음
+    """
+    
+    KEY_PREFIX = "idem:"
+    
+    # 값이 없으면 선점 값을 저장하고 nil, 있으면 기존 값 반환
+    RESERVE_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if value then
+    return value
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return false
+"""
+    
+    # 자신의 선점 값이거나 선점이 만료되어 비어 있으면 응답을 저장하고 nil, 다른 값이 있으면 그 값 반환
+    COMPLETE_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if value and value ~= ARGV[1] then
+    return value
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return false
+"""
+    
+    # 자신의 선점 값일 때만 삭제
+    RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+end
+return false
+"""
+    
+    # 선점 값 표시 (요청 해시 뒤에 붙음, 응답 JSON은 '{'로 시작하므로 구분됨)
+    PENDING_MARK = b"\x00"
+    
+    def __init__(
+        self,
+        url: str,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        pending_ttl_seconds: int = IDEMPOTENCY_PENDING_TTL_SECONDS,
+    ):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "IDEMPOTENCY_BACKEND=redis 사용 시 redis 패키지가 필요합니다 (uv sync --extra redis)"
+            ) from e
+        
+        # from_url은 커넥션 풀을 생성하므로 요청마다 연결하지 않음
+        self._redis = redis_asyncio.from_url(url)
+        self._ttl_seconds = ttl_seconds
+        self._pending_ttl_seconds = pending_ttl_seconds
+        # 스크립트는 EVALSHA로 실행 (서버에 없으면 EVAL로 재전송)
+        self._reserve = self._redis.register_script(self.RESERVE_SCRIPT)
+        self._complete = self._redis.register_script(self.COMPLETE_SCRIPT)
+        self._release = self._redis.register_script(self.RELEASE_SCRIPT)
+        self._locks = _ShardedLocks()
+        # 이 프로세스가 선점한 키 -> 선점 값 (같은 키는 lock()으로 직렬화되므로 키당 하나)
+        self._claims: Dict[str, bytes] = {}
+    
+    def lock(self, idempotency_key: str) -> asyncio.Lock:
+        """
+        같은 키의 선점 → 처리 → 저장을 직렬화하기 위한 잠금 반환
+        
+        워커 프로세스 내 동시 요청은 대기 후 저장된 응답을 받고, 프로세스 간에는 Redis 선점으로 중복 발권 방지
+        """
+        return self._locks.get(idempotency_key)
+    
+    def _is_pending(self, value: bytes) -> bool:
+        """저장된 값이 선점 표시인지 확인"""
+        return value[_HASH_SIZE:_HASH_SIZE + 1] == self.PENDING_MARK
+    
+    async def reserve(self, idempotency_key: str, request_hash: bytes) -> Tuple[str, Optional[bytes]]:
+        """
+        발권 전에 키를 원자적으로 선점
+        
+        Args:
+            idempotency_key: 멱등성 키
+            request_hash: 요청 해시 (fingerprint 결과)
+            
+        Returns:
+            - (RESERVED, None): 선점 성공, 발권 후 complete (실패 시 release) 호출
+            - (REPLAY, response_body): 동일한 요청의 저장된 응답 JSON 바이트
+            - (CONFLICT, None): 같은 키로 다른 요청이 처리됨 (처리 중 포함)
+            - (IN_PROGRESS, None): 같은 요청을 다른 워커가 처리 중
+        """
+        # 선점 값마다 난수를 붙여 만료 후 다른 워커가 다시 선점한 값과 구분
+        claim = request_hash + self.PENDING_MARK + os.urandom(8)
+        value = await self._reserve(
+            keys=[self.KEY_PREFIX + idempotency_key],
+            args=[claim, self._pending_ttl_seconds],
+        )
+        if value is None:
+            self._claims[idempotency_key] = claim
+            return (RESERVED, None)
+        
+        if value[:_HASH_SIZE] != request_hash:
+            return (CONFLICT, None)
+        if self._is_pending(value):
+            return (IN_PROGRESS, None)
+        return (REPLAY, value[_HASH_SIZE:])
+    
+    async def complete(self, idempotency_key: str, request_hash: bytes, response_body: bytes) -> Optional[bytes]:
+        """
+        선점한 키에 발권 응답 저장
+        
+        Args:
+            idempotency_key: 멱등성 키
+            request_hash: 요청 해시 (fingerprint 결과)
+            response_body: 직렬화된 응답 JSON 바이트
+            
+        Returns:
+            선점이 만료된 사이 다른 워커가 같은 요청의 응답을 먼저 저장했으면 그 응답, 아니면 None
+        """
+        claim = self._claims.pop(idempotency_key, b"")
+        value = await self._complete(
+            keys=[self.KEY_PREFIX + idempotency_key],
+            args=[claim, request_hash + response_body, self._ttl_seconds],
+        )
+        if value is None or self._is_pending(value) or value[:_HASH_SIZE] != request_hash:
+            return None
+        return value[_HASH_SIZE:]
+    
+    async def release(self, idempotency_key: str) -> None:
+        """발권 실패 시 선점 해제 (같은 키로 바로 재시도할 수 있도록)"""
+        claim = self._claims.pop(idempotency_key, None)
+        if claim is not None:
+            await self._release(keys=[self.KEY_PREFIX + idempotency_key], args=[claim])
+    
+    async def clear(self) -> None:
+        """멱등성 키 전체 삭제"""
+        async for key in self._redis.scan_iter(match=self.KEY_PREFIX + "*"):
+            await self._redis.delete(key)
+    
+    async def close(self) -> None:
+        """Redis 커넥션 풀 정리"""
+        await self._redis.aclose()
+
 
+def get_idempotency_backend() -> str:
+    """IDEMPOTENCY_BACKEND 환경 변수로 지정한 백엔드 이름 반환 (memory | redis, 기본값: memory)"""
+    return os.getenv("IDEMPOTENCY_BACKEND", "memory")
 
-def get_idempotency_cache() -> IdempotencyCache:
-    """전역 멱등성 캐시 인스턴스 반환"""
-    return _idempotency_cache
+
+def check_worker_count(workers: int) -> None:
+    """
+    워커 프로세스 수가 멱등성 백엔드와 맞는지 확인 (Gunicorn 설정과 main()에서 서버 시작 전에 호출)
+    
+    memory 백엔드는 워커 프로세스마다 캐시를 따로 보관하므로, 다른 워커로 전달된
+    Idempotency-Key 재시도가 캐시 미스로 중복 발권되지 않도록 워커를 1개로 제한
+    
+    Raises:
+        RuntimeError: memory 백엔드에서 워커를 2개 이상 지정한 경우
+    """
+    if workers > 1 and get_idempotency_backend() == "memory":
+        raise RuntimeError(
+            "IDEMPOTENCY_BACKEND=memory에서는 워커를 1개만 실행할 수 있습니다 "
+            "(여러 워커는 IDEMPOTENCY_BACKEND=redis 사용)"
+        )
+
+
+@lru_cache(maxsize=1)
+def get_idempotency_cache() -> IdempotencyCache | RedisIdempotencyCache:
+    """
+    전역 멱등성 캐시 인스턴스 반환
+    
+    IDEMPOTENCY_BACKEND 환경 변수로 백엔드 선택 (memory | redis, 기본값: memory)
+    """
+    backend = get_idempotency_backend()
+    if backend == "memory":
+        return IdempotencyCache()
+    if backend == "redis":
+        return RedisIdempotencyCache(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    raise ValueError(f"지원하지 않는 IDEMPOTENCY_BACKEND: {backend}")
@@ -0,0 +1,68 @@
+"""티켓 조회 캐시 유틸리티"""
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Tuple
+
+
+class TicketCache:
+    """티켓 ID를 키로 단건 조회 결과를 캐싱하는 TTL + LRU 캐시"""
+    
+    def __init__(self, maxsize: int = 50_000, ttl_seconds: float = 5.0):
+        # key: ticket_id, value: (expires_at, ticket)
+        self._cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._maxsize = maxsize
+        # 다른 워커 프로세스의 환불이 반영되지 않는 시간을 제한하기 위해 TTL을 짧게 유지
+        self._ttl_seconds = ttl_seconds
+    
+    def get(self, ticket_id: str) -> Optional[Any]:
+        """
+        캐시에서 티켓을 조회
+        
+        Args:
+            ticket_id: 티켓 ID
+        
+        Returns:
+            캐시된 티켓 또는 None (없거나 만료됨)
+        """
+        entry = self._cache.get(ticket_id)
+        if entry is None:
+            return None
+        
+        expires_at, ticket = entry
+        if expires_at < time.monotonic():
+            del self._cache[ticket_id]
+            return None
+        
+        self._cache.move_to_end(ticket_id)
+        return ticket
+    
+    def set(self, ticket_id: str, ticket: Any) -> None:
+        """
+        캐시에 티켓을 저장 (최대 크기를 넘으면 가장 오래 사용되지 않은 항목 제거)
+        
+        Args:
+            ticket_id: 티켓 ID
+            ticket: 티켓 데이터
+        """
+        self._cache[ticket_id] = (time.monotonic() + self._ttl_seconds, ticket)
+        self._cache.move_to_end(ticket_id)
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+    
+    def invalidate(self, ticket_ids: Iterable[str]) -> None:
+        """변경된 티켓을 캐시에서 제거"""
+        for ticket_id in ticket_ids:
+            self._cache.pop(ticket_id, None)
+    
+    def clear(self) -> None:
+        """캐시 초기화"""
+        self._cache.clear()
+
+
+# 전역 캐시 인스턴스
+_ticket_cache = TicketCache()
+
+
+def get_ticket_cache() -> TicketCache:
+    """전역 티켓 캐시 인스턴스 반환"""
+    return _ticket_cache
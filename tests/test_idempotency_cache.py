@@ -0,0 +1,124 @@
+"""메모리 멱등성 캐시 테스트 (힙 기반 만료, LRU 제거, 필드별 dict 동기화)"""
+import asyncio
+import time
+
+import pytest
+
+from movie_ticketing_backend.util.idempotency import CONFLICT, REPLAY, RESERVED, IdempotencyCache
+
+HASH = b"h" * 16
+OTHER_HASH = b"o" * 16
+
+
+class FakeClock:
+    """time.monotonic 대체용 수동 시계"""
+    
+    def __init__(self):
+        self.now = 1_000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+
+def _assert_in_sync(cache: IdempotencyCache) -> None:
+    assert cache._expires.keys() == cache._hashes.keys() == cache._responses.keys()
+
+
+def test_reserve_states():
+    async def scenario():
+        cache = IdempotencyCache(ttl_seconds=10)
+        reserved = await cache.reserve("k", HASH)
+        await cache.complete("k", HASH, b"{}")
+        return reserved, await cache.reserve("k", HASH), await cache.reserve("k", OTHER_HASH)
+    
+    assert asyncio.run(scenario()) == ((RESERVED, None), (REPLAY, b"{}"), (CONFLICT, None))
+
+
+def test_expired_entry_is_removed_from_all_fields(clock):
+    async def scenario():
+        cache = IdempotencyCache(ttl_seconds=10)
+        await cache.set("k", HASH, b"old")
+        clock.now += 10
+        # 만료된 항목은 정리 전에도 조회되지 않음
+        assert await cache.get("k", HASH) is None
+        await cache.set("other", HASH, b"{}")
+        return cache
+    
+    cache = asyncio.run(scenario())
+    assert "k" not in cache._expires
+    _assert_in_sync(cache)
+
+
+def test_stale_heap_entry_does_not_expire_overwritten_key(clock):
+    async def scenario():
+        cache = IdempotencyCache(ttl_seconds=10)
+        await cache.set("k", HASH, b"old")
+        clock.now += 5
+        await cache.set("k", HASH, b"new")
+        # 첫 저장의 힙 항목이 만료되어 꺼내지지만 현재 항목은 남아야 함
+        clock.now += 6
+        await cache.set("other", HASH, b"{}")
+        fresh = await cache.get("k", HASH)
+        clock.now += 5
+        await cache.set("other", HASH, b"{}")
+        return cache, fresh
+    
+    cache, fresh = asyncio.run(scenario())
+    assert fresh == (True, b"new")
+    assert "k" not in cache._expires
+    _assert_in_sync(cache)
+
+
+def test_lru_eviction_keeps_recently_used_keys(clock):
+    async def scenario():
+        cache = IdempotencyCache(ttl_seconds=10, max_entries=2)
+        await cache.set("a", HASH, b"a")
+        await cache.set("b", HASH, b"b")
+        # 조회한 키는 가장 최근 사용으로 이동
+        await cache.get("a", HASH)
+        await cache.set("c", HASH, b"c")
+        return cache
+    
+    cache = asyncio.run(scenario())
+    assert list(cache._expires) == ["a", "c"]
+    assert cache.evictions == 1
+    _assert_in_sync(cache)
+
+
+def test_heap_entry_of_evicted_key_is_skipped(clock):
+    async def scenario():
+        cache = IdempotencyCache(ttl_seconds=10, max_entries=1)
+        await cache.set("a", HASH, b"a")
+        await cache.set("b", HASH, b"b")
+        clock.now += 1
+        # 제거된 키를 다시 저장한 뒤 제거 전 힙 항목이 만료되어도 새 항목은 남아야 함
+        await cache.set("a", HASH, b"a2")
+        clock.now += 9.5
+        await cache.set("a", HASH, b"a3")
+        return cache, await cache.get("a", HASH)
+    
+    cache, fresh = asyncio.run(scenario())
+    assert fresh == (True, b"a3")
+    assert cache.evictions == 2
+    _assert_in_sync(cache)
+
+
+def test_heap_is_rebuilt_from_live_entries(clock):
+    async def scenario():
+        cache = IdempotencyCache(ttl_seconds=10, max_entries=2)
+        for index in range(20):
+            clock.now += 0.01
+            await cache.set("k%d" % (index % 3), HASH, b"{}")
+        return cache
+    
+    cache = asyncio.run(scenario())
+    assert len(cache._expiry_heap) <= 2 * cache._max_entries
+    assert {key for _, key in cache._expiry_heap} >= cache._expires.keys()
+    _assert_in_sync(cache)
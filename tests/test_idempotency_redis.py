@@ -0,0 +1,130 @@
+"""Redis 멱등성 캐시 선점/저장/해제 프로토콜 테스트 (fakeredis로 여러 워커가 같은 서버를 공유)"""
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from movie_ticketing_backend.util.idempotency import (  # noqa: E402
+    CONFLICT,
+    IN_PROGRESS,
+    REPLAY,
+    RESERVED,
+    RedisIdempotencyCache,
+    fingerprint,
+)
+
+KEY = "key-1"
+REQUEST_HASH = fingerprint(b'{"quantity":1}')
+OTHER_HASH = fingerprint(b'{"quantity":2}')
+
+
+@pytest.fixture
+def make_cache(monkeypatch):
+    """같은 FakeServer에 연결된 RedisIdempotencyCache(워커 하나에 해당)를 만드는 팩토리"""
+    import redis.asyncio
+    
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis.asyncio, "from_url", lambda url: fakeredis.FakeAsyncRedis(server=server))
+    
+    def factory(**kwargs) -> RedisIdempotencyCache:
+        return RedisIdempotencyCache("redis://test", **kwargs)
+    
+    return factory
+
+
+def test_reserve_then_replay_from_another_worker(make_cache):
+    async def scenario():
+        first, second = make_cache(), make_cache()
+        assert await first.reserve(KEY, REQUEST_HASH) == (RESERVED, None)
+        assert await first.complete(KEY, REQUEST_HASH, b'{"tickets":[]}') is None
+        return await second.reserve(KEY, REQUEST_HASH)
+    
+    assert asyncio.run(scenario()) == (REPLAY, b'{"tickets":[]}')
+
+
+def test_different_request_conflicts(make_cache):
+    async def scenario():
+        first, second = make_cache(), make_cache()
+        await first.reserve(KEY, REQUEST_HASH)
+        pending = await second.reserve(KEY, OTHER_HASH)
+        await first.complete(KEY, REQUEST_HASH, b'{"tickets":[]}')
+        done = await second.reserve(KEY, OTHER_HASH)
+        return pending, done
+    
+    assert asyncio.run(scenario()) == ((CONFLICT, None), (CONFLICT, None))
+
+
+def test_same_request_in_progress_on_another_worker(make_cache):
+    async def scenario():
+        first, second = make_cache(), make_cache()
+        await first.reserve(KEY, REQUEST_HASH)
+        return await second.reserve(KEY, REQUEST_HASH)
+    
+    assert asyncio.run(scenario()) == (IN_PROGRESS, None)
+
+
+def test_concurrent_reserve_issues_once(make_cache):
+    async def worker(cache: RedisIdempotencyCache, name: bytes):
+        async with cache.lock(KEY):
+            state, body = await cache.reserve(KEY, REQUEST_HASH)
+            if state != RESERVED:
+                return state
+            await asyncio.sleep(0.01)
+            await cache.complete(KEY, REQUEST_HASH, name)
+            return RESERVED
+    
+    async def scenario():
+        return await asyncio.gather(*(worker(make_cache(), b'{"n":%d}' % n) for n in range(5)))
+    
+    states = asyncio.run(scenario())
+    assert states.count(RESERVED) == 1
+    assert set(states) - {RESERVED} <= {IN_PROGRESS, REPLAY}
+
+
+def test_release_allows_immediate_retry(make_cache):
+    async def scenario():
+        first, second = make_cache(), make_cache()
+        await first.reserve(KEY, REQUEST_HASH)
+        await first.release(KEY)
+        return await second.reserve(KEY, REQUEST_HASH)
+    
+    assert asyncio.run(scenario()) == (RESERVED, None)
+
+
+def test_release_keeps_claim_taken_over_by_another_worker(make_cache):
+    async def scenario():
+        expired, current = make_cache(pending_ttl_seconds=1), make_cache()
+        await expired.reserve(KEY, REQUEST_HASH)
+        await asyncio.sleep(1.1)
+        await current.reserve(KEY, REQUEST_HASH)
+        # 만료된 선점의 해제가 다른 워커의 선점을 지우면 안 됨
+        await expired.release(KEY)
+        return await make_cache().reserve(KEY, REQUEST_HASH)
+    
+    assert asyncio.run(scenario()) == (IN_PROGRESS, None)
+
+
+def test_expired_claim_complete_returns_response_stored_by_another_worker(make_cache):
+    async def scenario():
+        expired, current = make_cache(pending_ttl_seconds=1), make_cache()
+        await expired.reserve(KEY, REQUEST_HASH)
+        await asyncio.sleep(1.1)
+        assert await current.reserve(KEY, REQUEST_HASH) == (RESERVED, None)
+        await current.complete(KEY, REQUEST_HASH, b'{"by":"current"}')
+        late = await expired.complete(KEY, REQUEST_HASH, b'{"by":"expired"}')
+        return late, await make_cache().reserve(KEY, REQUEST_HASH)
+    
+    assert asyncio.run(scenario()) == (b'{"by":"current"}', (REPLAY, b'{"by":"current"}'))
+
+
+def test_expired_claim_complete_stores_response_when_key_is_empty(make_cache):
+    async def scenario():
+        expired = make_cache(pending_ttl_seconds=1)
+        await expired.reserve(KEY, REQUEST_HASH)
+        await asyncio.sleep(1.1)
+        late = await expired.complete(KEY, REQUEST_HASH, b'{"by":"expired"}')
+        return late, await make_cache().reserve(KEY, REQUEST_HASH)
+    
+    assert asyncio.run(scenario()) == (None, (REPLAY, b'{"by":"expired"}'))
@@ -0,0 +1,61 @@
+"""UUIDv7 생성기 테스트 (RFC 9562 버전/변형 비트, 단조 증가)"""
+import time
+import uuid
+
+from movie_ticketing_backend.util.uuid7 import UUID7Generator, uuid7, uuid7_many
+
+NOW_NS = 1_760_000_000_000 * 1_000_000
+
+
+def _timestamp_ms(value: uuid.UUID) -> int:
+    return value.int >> 80
+
+
+def _counter(value: uuid.UUID) -> int:
+    return (value.int >> 64) & 0xFFF
+
+
+def test_version_and_variant_bits():
+    for value in [uuid7(), *uuid7_many(100)]:
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+
+def test_timestamp_is_unix_milliseconds():
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert before <= _timestamp_ms(value) <= after
+
+
+def test_monotonic_across_calls():
+    values = [uuid7() for _ in range(1_000)] + uuid7_many(1_000) + [uuid7()]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_monotonic_within_same_millisecond(monkeypatch):
+    monkeypatch.setattr(time, "time_ns", lambda: NOW_NS)
+    values = UUID7Generator().generate_many(100)
+    assert values == sorted(values)
+    assert {_timestamp_ms(value) for value in values} == {NOW_NS // 1_000_000}
+
+
+def test_counter_overflow_advances_timestamp(monkeypatch):
+    monkeypatch.setattr(time, "time_ns", lambda: NOW_NS)
+    # 카운터 시작값과 무관하게 12비트(4096)를 넘도록 생성
+    values = UUID7Generator().generate_many(5_000)
+    assert values == sorted(values)
+    assert _timestamp_ms(values[-1]) == NOW_NS // 1_000_000 + 1
+    assert all(value.version == 7 for value in values)
+
+
+def test_clock_going_backwards_stays_monotonic(monkeypatch):
+    generator = UUID7Generator()
+    monkeypatch.setattr(time, "time_ns", lambda: NOW_NS)
+    first = generator.generate()
+    monkeypatch.setattr(time, "time_ns", lambda: NOW_NS - 5_000 * 1_000_000)
+    second = generator.generate()
+    assert second > first
+    assert _timestamp_ms(second) == _timestamp_ms(first)
+    assert _counter(second) == _counter(first) + 1